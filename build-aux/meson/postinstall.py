@@ -2,6 +2,7 @@
 
 from os import environ, path
 from subprocess import call
+import compileall
 
 prefix = environ.get('MESON_INSTALL_PREFIX', '/usr')
 datadir = path.join(prefix, 'share')
@@ -18,3 +19,8 @@ if not destdir:
 	print('Compiling GSettings schemas…')
 	call(['glib-compile-schemas', path.join(datadir, 'glib-2.0', 'schemas')])
 
+	# The installation directory is usually not writable by the user, so
+	# without this, the modules would be compiled again at each launch.
+	print('Compiling Python modules…')
+	compileall.compile_dir(path.join(datadir, 'drawing', 'drawing'), quiet=1)
+
@@ -15,16 +15,32 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gtk
+from gi.repository import Gtk, Gdk, GLib
+from .utilities import utilities_get_ui_string
+
+# The headerbar is adapted a lot while resizing the window, animations only make
+# it more expensive (especially with software rendering).
+HEADERBAR_CSS = b'''
+headerbar.drawing-hb { transition: none; box-shadow: none; }
+headerbar.drawing-hb button { transition: none; }
+'''
 
 class DrDecoManagerMenubar():
 	__gtype_name__ = 'DrDecoManagerMenubar'
 	UI_PATH = '/com/github/maoschanz/drawing/ui/'
 
 	def __init__(self, window, use_menubar):
+		window.app.ensure_menubar()
 		window.set_show_menubar(use_menubar)
 		self._window = window
 		self._main_menu_btn = None
+		# Translated strings are looked up once, not at each title update
+		app_name = _("Drawing").replace('%', '%%')
+		self._title_format = app_name + ' ~ %s ~ %s'
+		self._undo_label = _("Undo")
+		self._undo_format = _("Undo %s")
+		self._redo_label = _("Redo")
+		self._redo_format = _("Redo %s")
 		if use_menubar:
 			window.set_titlebar(None) # that's an arbitrary restriction
 
@@ -34,7 +50,7 @@ class DrDecoManagerMenubar():
 	############################################################################
 
 	def set_titles(self, title_label, subtitle_label):
-		full_title = _("Drawing") + ' ~ ' + title_label + ' ~ ' + subtitle_label
+		full_title = self._title_format % (title_label, subtitle_label)
 		self._window.set_title(full_title)
 
 	def toggle_menu(self):
@@ -64,12 +80,17 @@ class DrDecoManagerMenubar():
 
 class DrDecoManagerHeaderbar(DrDecoManagerMenubar):
 	__gtype_name__ = 'DrDecoManagerHeaderbar'
+	# Width limits already measured by previous windows, see init_adaptability
+	_limit_size_cache = {}
+	_css_is_loaded = False
 
 	def __init__(self, is_eos, window):
 		super().__init__(window, False)
 		self._is_narrow = True # This is reducing the complexity of resizing,
 		# but its main goal is to avoid a GTK minor bug where the initial
 		# bunch of configure-event signals was sent to soon.
+		self._last_width = -1
+		self._applied_state = None # what widgets currently look like
 
 		# Build the window's headerbar. If "is_eos" is true, the headerbar will
 		# follow elementaryOS guidelines, else it will follow GNOME guidelines.
@@ -77,8 +98,12 @@ class DrDecoManagerHeaderbar(DrDecoManagerMenubar):
 			resource_path = self.UI_PATH + 'headerbar-eos.ui'
 		else:
 			resource_path = self.UI_PATH + 'headerbar.ui'
-		builder = Gtk.Builder.new_from_resource(resource_path)
+		self._resource_path = resource_path # identifies the layout
+		ui_string = utilities_get_ui_string(resource_path)
+		builder = Gtk.Builder.new_from_string(ui_string, -1)
 		self._widget = builder.get_object('header_bar')
+		self._load_css()
+		self._widget.get_style_context().add_class('drawing-hb')
 		window.set_titlebar(self._widget)
 
 		# Code differences are kept minimal between the 2 cases: widgets will
@@ -100,7 +125,8 @@ class DrDecoManagerHeaderbar(DrDecoManagerMenubar):
 		self._limit_size = 750
 		self._manual_correction = 0
 
-		builder.add_from_resource(self.UI_PATH + 'win-menus.ui')
+		menus_string = utilities_get_ui_string(self.UI_PATH + 'win-menus.ui')
+		builder.add_from_string(menus_string)
 		if is_eos:
 			self._init_menus_eos(builder)
 		else:
@@ -110,6 +136,16 @@ class DrDecoManagerHeaderbar(DrDecoManagerMenubar):
 		# value of self._is_narrow
 		self._main_menu_btn.set_menu_model(self._long_primary_menu)
 
+	def _load_css(self):
+		"""Add the CSS for all headerbars, once for the whole app."""
+		if DrDecoManagerHeaderbar._css_is_loaded:
+			return
+		css_provider = Gtk.CssProvider()
+		css_provider.load_from_data(HEADERBAR_CSS)
+		Gtk.StyleContext.add_provider_for_screen(Gdk.Screen.get_default(), \
+		                css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+		DrDecoManagerHeaderbar._css_is_loaded = True
+
 	def _init_menus_gnome(self, builder):
 		"""Sets the menus for the GNOME/Budgie layout: `self._hidable_widget_2`
 		is the "New Image" button here."""
@@ -143,55 +179,81 @@ class DrDecoManagerHeaderbar(DrDecoManagerMenubar):
 	def set_undo_label(self, label):
 		super().set_undo_label(label)
 		if label is None:
-			self._undo_btn.set_tooltip_text(_("Undo"))
+			self._undo_btn.set_tooltip_text(self._undo_label)
 		else:
-			self._undo_btn.set_tooltip_text(_("Undo %s") % label)
+			self._undo_btn.set_tooltip_text(self._undo_format % label)
 
 	def set_redo_label(self, label):
 		super().set_redo_label(label)
 		if label is None:
-			self._redo_btn.set_tooltip_text(_("Redo"))
+			self._redo_btn.set_tooltip_text(self._redo_label)
 		else:
-			self._redo_btn.set_tooltip_text(_("Redo %s") % label)
+			self._redo_btn.set_tooltip_text(self._redo_format % label)
 
 	############################################################################
 	# Adaptability #############################################################
 
 	def init_adaptability(self):
-		# Header bar width limit
-		self._widget.show_all()
-		widgets_width = self._hidable_widget_1.get_preferred_width()[0] \
-		              + self._hidable_widget_2.get_preferred_width()[0] \
-		                     + self._save_long.get_preferred_width()[0] \
-		                    - self._save_short.get_preferred_width()[0] \
-		                      + self._undo_btn.get_preferred_width()[0] \
-		                      + self._redo_btn.get_preferred_width()[0]
-		widgets_width = widgets_width + self._manual_correction
-		self._limit_size = widgets_width * 2.5 # 100% arbitrary
+		# Header bar width limit. The widgets' preferred widths don't depend on
+		# the window, so they're measured only once per layout and language.
+		cache_key = (self._resource_path, GLib.getenv('LANG') or '')
+		if cache_key in self._limit_size_cache:
+			self._limit_size = self._limit_size_cache[cache_key]
+		else:
+			self._widget.show_all()
+			self._applied_state = None
+			self._widget.freeze_child_notify()
+			widgets_width = self._hidable_widget_1.get_preferred_width()[0] \
+			              + self._hidable_widget_2.get_preferred_width()[0] \
+			                     + self._save_long.get_preferred_width()[0] \
+			                    - self._save_short.get_preferred_width()[0] \
+			                      + self._undo_btn.get_preferred_width()[0] \
+			                      + self._redo_btn.get_preferred_width()[0]
+			self._widget.thaw_child_notify()
+			widgets_width = widgets_width + self._manual_correction
+			self._limit_size = widgets_width * 2.5 # 100% arbitrary
+			self._limit_size_cache[cache_key] = self._limit_size
 		# print(self._limit_size)
+		self._last_width = -1
 		self.set_compact(True)
+		# The first allocations aren't reliable, so the actual adaptation waits
+		# for the window to be done with its startup.
+		GLib.idle_add(self._adapt_when_idle, priority=GLib.PRIORITY_LOW)
+
+	def _adapt_when_idle(self):
 		self.adapt_to_window_size()
+		return False
 
 	def adapt_to_window_size(self):
-		can_expand = (self._widget.get_allocated_width() > self._limit_size)
-		incoherent = (can_expand == self._is_narrow)
-		if incoherent:
-			self.set_compact(not self._is_narrow)
+		width = self._widget.get_allocated_width()
+		can_expand = (width > self._limit_size)
+		if can_expand != self._is_narrow:
+			return
+		# Resizing sends a lot of signals: near the width of the last
+		# transition, the headerbar isn't changed again to avoid flickering.
+		if abs(width - self._last_width) < 8:
+			return
+		self._last_width = width
+		self.set_compact(not self._is_narrow)
 
 	def set_compact(self, state):
 		"""Set the compactness of the headerbar: if the parameter is True, wide
 		widgets will be hidden in favor of narrow ones. Else, the opposite."""
 		# Instead of a boolean, `state` could be an integer, which would be
 		# far more complex to handle, but would allow thinner granularity.
+		self._is_narrow = state
+		if state == self._applied_state:
+			return
 		if state:
 			self._main_menu_btn.set_menu_model(self._long_primary_menu)
 		else:
 			self._main_menu_btn.set_menu_model(self._short_primary_menu)
-		self._save_long.set_visible(not state)
-		self._save_short.set_visible(state)
-		self._hidable_widget_1.set_visible(not state)
-		self._hidable_widget_2.set_visible(not state)
-		self._is_narrow = state
+		widgets = (self._save_long, self._save_short, \
+		                       self._hidable_widget_1, self._hidable_widget_2)
+		visibilities = (not state, state, not state, not state)
+		for widget, visible in zip(widgets, visibilities):
+			widget.set_visible(visible)
+		self._applied_state = state
 
 	############################################################################
 ################################################################################
@@ -206,12 +268,15 @@ class DrDecoManagerToolbar(DrDecoManagerMenubar):
 			resource_path = self.UI_PATH + 'toolbar-symbolic.ui'
 		else:
 			resource_path = self.UI_PATH + 'toolbar.ui'
-		builder = Gtk.Builder.new_from_resource(resource_path)
+		ui_string = utilities_get_ui_string(resource_path)
+		builder = Gtk.Builder.new_from_string(ui_string, -1)
 
 		# Composition over inheritance
 		self._widget = builder.get_object('toolbar')
 		window.toolbar_box.pack_start(self._widget, True, True, 0)
-		window.toolbar_box.show_all()
+		self._widget.show_all()
+		if not window.toolbar_box.get_visible():
+			window.toolbar_box.set_visible(True)
 
 		# Mandatory widget name, used for the `win.main_menu` action
 		self._main_menu_btn = builder.get_object('main_menu_btn')
@@ -222,7 +287,8 @@ class DrDecoManagerToolbar(DrDecoManagerMenubar):
 		# self._redo_btn = builder.get_object('redo_btn')
 
 		# The toolbar has menus which need to be set manually
-		builder.add_from_resource(self.UI_PATH + 'win-menus.ui')
+		menus_string = utilities_get_ui_string(self.UI_PATH + 'win-menus.ui')
+		builder.add_from_string(menus_string)
 
 		new_btn = builder.get_object('new_menu_btn')
 		new_menu = Gtk.Menu.new_from_model(builder.get_object('new-image-menu'))
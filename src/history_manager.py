@@ -176,14 +176,17 @@ class DrHistoryManager():
 		last_save_index = self._get_last_state_index(True)
 		self._image.restore_first_pixbuf()
 		history = self._undo_history.copy()
-		self._undo_history = []
-		for op in history:
-			if history.index(op) > last_save_index:
-				# print("do", op['tool_id'])
-				self._get_tool(op['tool_id']).simple_apply_operation(op)
-			else:
-				# print("skip", op['tool_id'])
-				self._undo_history.append(op)
+		self._undo_history = history[:last_save_index + 1]
+		remaining_ops = iter(history[last_save_index + 1:])
+		# An operation failing is reported and skipped, then the loop resumes
+		# with the next ones, so only failures pay for the exception handling.
+		while True:
+			try:
+				for op in remaining_ops:
+					self._get_tool(op['tool_id']).simple_apply_operation_fast(op)
+				break
+			except Exception as e:
+				self._image.window.prompt_message(True, str(e))
 		self._image.update()
 		self._image.update_history_sensitivity()
 
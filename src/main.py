@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import sys, gi
+import os, sys, gi
 gi.require_version('Gtk', '3.0')
 gi.require_version('PangoCairo', '1.0')
 from gi.repository import Gtk, Gio, GLib, Gdk
@@ -27,6 +27,8 @@ APP_ID = 'com.github.maoschanz.drawing'
 APP_PATH = '/com/github/maoschanz/drawing'
 BUG_REPORT_URL = 'https://github.com/maoschanz/drawing/issues/new/choose'
 FLATPAK_BINARY_PATH = '/app/bin/drawing'
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.webp', \
+                                                             '.gif', '.tiff'})
 
 def main(version):
 	app = Application(version)
@@ -37,6 +39,43 @@ def main(version):
 class Application(Gtk.Application):
 	shortcuts_window = None
 	prefs_window = None
+	about_dialog = None
+
+	# Pages of the user help manual, by action name suffix
+	_HELP_URIS = {
+		'index': 'help:drawing',
+		'main': 'help:drawing/main_features',
+		'zoom': 'help:drawing/zoom_preview',
+		'fullscreen': 'help:drawing/fullscreen',
+		'tools': 'help:drawing/tools_classic',
+		'colors': 'help:drawing/tools_classic_colors',
+		'transform': 'help:drawing/tools_transform',
+		'selection': 'help:drawing/tools_selection',
+		'prefs': 'help:drawing/preferences',
+		'whats_new': 'help:drawing/whats_new',
+	}
+
+	# App-wide actions: name, name of the callback method, and accelerators
+	_ACTIONS_SPECS = (
+		('new_window', 'on_new_window', ['<Ctrl>n']),
+		('settings', 'on_prefs', None),
+		('report_bug', 'on_report', None), # only for unstable versions
+		('shortcuts', 'on_shortcuts', ['<Ctrl>question', '<Ctrl>F1']),
+
+		('help', 'on_help_index', ['F1']),
+		('help_main', 'on_help_main', None),
+		('help_zoom', 'on_help_zoom', None),
+		('help_fullscreen', 'on_help_fullscreen', None),
+		('help_tools', 'on_help_tools', None),
+		('help_colors', 'on_help_colors', None),
+		('help_transform', 'on_help_transform', None),
+		('help_selection', 'on_help_selection', None),
+		('help_prefs', 'on_help_prefs', None),
+		('help_whats_new', 'on_help_whats_new', None),
+
+		('about', 'on_about', ['<Shift>F1']),
+		('quit', 'on_quit', ['<Ctrl>q']),
+	)
 
 	############################################################################
 	# Initialization ###########################################################
@@ -48,8 +87,11 @@ class Application(Gtk.Application):
 		GLib.set_application_name(_("Drawing"))
 		GLib.set_prgname(APP_ID)
 		self._version = version
+		# odd middle numbers are for unstable versions, see `is_beta`
+		self._is_beta = (int(version.split('.')[1]) & 1) == 1
 		self.has_tools_in_menubar = False
 		self.runs_in_sandbox = False
+		self._menubar_model = None
 
 		self.connect('startup', self.on_startup)
 		self.register(None)
@@ -71,37 +113,33 @@ class Application(Gtk.Application):
 
 		icon_theme = Gtk.IconTheme.get_default()
 		icon_theme.add_resource_path(APP_PATH + '/icons')
-		icon_theme.add_resource_path(APP_PATH + '/tools/icons')
 
 	def on_startup(self, *args):
-		"""Called only once, add app-wide menus and actions, and all accels."""
+		"""Called only once, add app-wide actions, and all accels. The menus are
+		added later by `ensure_menubar`."""
 		self._build_actions()
+
+	def ensure_menubar(self):
+		"""Build the app-wide menubar the first time a window needs it. Windows
+		always edit its model (tools and options submenus), even if their
+		layout doesn't display it, but running the app only to handle the
+		command line (e.g. `--version`) doesn't parse it at all."""
+		if self._menubar_model is not None:
+			return
 		builder = Gtk.Builder.new_from_resource(APP_PATH + '/ui/app-menus.ui')
-		menubar_model = builder.get_object('menu-bar')
-		self.set_menubar(menubar_model)
+		self._menubar_model = builder.get_object('menu-bar')
+		self.set_menubar(self._menubar_model)
 
 	def _build_actions(self):
 		"""Add all app-wide actions."""
-		self.add_action_simple('new_window', self.on_new_window, ['<Ctrl>n'])
-		self.add_action_simple('settings', self.on_prefs, None)
-		if self.is_beta():
-			self.add_action_simple('report_bug', self.on_report, None)
-		self.add_action_simple('shortcuts', self.on_shortcuts, \
-		                                         ['<Ctrl>question', '<Ctrl>F1'])
-
-		self.add_action_simple('help', self.on_help_index, ['F1'])
-		self.add_action_simple('help_main', self.on_help_main, None)
-		self.add_action_simple('help_zoom', self.on_help_zoom, None)
-		self.add_action_simple('help_fullscreen', self.on_help_fullscreen, None)
-		self.add_action_simple('help_tools', self.on_help_tools, None)
-		self.add_action_simple('help_colors', self.on_help_colors, None)
-		self.add_action_simple('help_transform', self.on_help_transform, None)
-		self.add_action_simple('help_selection', self.on_help_selection, None)
-		self.add_action_simple('help_prefs', self.on_help_prefs, None)
-		self.add_action_simple('help_whats_new', self.on_help_whats_new, None)
-
-		self.add_action_simple('about', self.on_about, ['<Shift>F1'])
-		self.add_action_simple('quit', self.on_quit, ['<Ctrl>q'])
+		for action_name, cb_name, shortcuts in self._ACTIONS_SPECS:
+			if action_name == 'report_bug' and not self.is_beta():
+				continue
+			action = Gio.SimpleAction.new(action_name, None)
+			action.connect('activate', getattr(self, cb_name))
+			self.add_action(action)
+			if shortcuts is not None:
+				self.set_accels_for_action('app.' + action_name, shortcuts)
 
 	############################################################################
 	# Opening windows & CLI handling ###########################################
@@ -154,7 +192,7 @@ class Application(Gtk.Application):
 				self.open_window_with_content(None, True)
 			else:
 				win.present()
-				self.props.active_window.build_image_from_clipboard()
+				win.build_image_from_clipboard()
 
 		elif options.contains('new-tab') and len(arguments) == 1:
 			# If '-t' but no file given as argument
@@ -163,21 +201,15 @@ class Application(Gtk.Application):
 				self.on_new_window()
 			else:
 				win.present()
-				self.props.active_window.build_new_image()
+				win.build_new_image()
 
 		elif options.contains('new-window'):
 			# it opens one new window per file given as argument, or just one
 			# new window if no argument is a valid enough file.
-			windows_counter = 0
-			for fpath in arguments:
-				f = self._get_valid_file(args[1], fpath)
-				# here f can be a GioFile or a boolea; True would mean the app
-				# should open a new blank image.
-				if f != False:
-					f = None if f == True else f
-					self.open_window_with_content(f, False)
-					windows_counter = windows_counter + 1
-			if windows_counter == 0:
+			valid_files = self._get_valid_files(args[1], arguments)
+			for f in valid_files:
+				self.open_window_with_content(f, False)
+			if len(valid_files) == 0:
 				self.on_new_window()
 
 		elif len(arguments) == 1:
@@ -185,18 +217,13 @@ class Application(Gtk.Application):
 
 		else:
 			# giving files without '-n' is equivalent to giving files with '-t'
-			for fpath in arguments:
-				f = self._get_valid_file(args[1], fpath)
-				# here f can be a GioFile or a boolean: True would mean the app
-				# should open a new blank image.
-				if f != False:
-					f = None if f == True else f
-					win = self.props.active_window
-					if not win:
-						self.open_window_with_content(f, False)
-					else:
-						win.present()
-						self.props.active_window.build_new_tab(gfile=f)
+			for f in self._get_valid_files(args[1], arguments):
+				win = self.props.active_window
+				if not win:
+					self.open_window_with_content(f, False)
+				else:
+					win.present()
+					win.build_new_tab(gfile=f)
 
 		# I don't even know if i should return something
 		return 0
@@ -215,10 +242,12 @@ class Application(Gtk.Application):
 
 	def on_shortcuts(self, *args):
 		"""Action callback, showing the 'shortcuts' dialog."""
-		if self.shortcuts_window is not None:
-			self.shortcuts_window.destroy()
-		builder = Gtk.Builder().new_from_resource(APP_PATH + '/ui/shortcuts.ui')
-		self.shortcuts_window = builder.get_object('shortcuts-window')
+		if self.shortcuts_window is None:
+			# It's read-only, so it's built once, and only hidden when closed
+			builder = Gtk.Builder().new_from_resource(APP_PATH + '/ui/shortcuts.ui')
+			self.shortcuts_window = builder.get_object('shortcuts-window')
+			self.shortcuts_window.connect('delete-event', \
+			                                    lambda w, e: w.hide_on_delete())
 		self.shortcuts_window.present()
 
 	def on_prefs(self, *args):
@@ -232,38 +261,45 @@ class Application(Gtk.Application):
 
 	def on_help_index(self, *args):
 		"""Action callback, showing the index of user help manual."""
-		self._show_help_page('')
+		self._show_help_page('index')
 
 	def on_help_main(self, *args):
-		self._show_help_page('/main_features')
+		self._show_help_page('main')
 
 	def on_help_zoom(self, *args):
-		self._show_help_page('/zoom_preview')
+		self._show_help_page('zoom')
 
 	def on_help_fullscreen(self, *args):
-		self._show_help_page('/fullscreen')
+		self._show_help_page('fullscreen')
 
 	def on_help_tools(self, *args):
-		self._show_help_page('/tools_classic')
+		self._show_help_page('tools')
 
 	def on_help_colors(self, *args):
-		self._show_help_page('/tools_classic_colors')
+		self._show_help_page('colors')
 
 	def on_help_transform(self, *args):
-		self._show_help_page('/tools_transform')
+		self._show_help_page('transform')
 
 	def on_help_selection(self, *args):
-		self._show_help_page('/tools_selection')
+		self._show_help_page('selection')
 
 	def on_help_prefs(self, *args):
-		self._show_help_page('/preferences')
+		self._show_help_page('prefs')
 
 	def on_help_whats_new(self, *args):
-		self._show_help_page('/whats_new')
+		self._show_help_page('whats_new')
 
 	def on_about(self, *args):
 		"""Action callback, showing the "about" dialog."""
-		about_dialog = Gtk.AboutDialog(transient_for=self.props.active_window,
+		if self.about_dialog is None:
+			self.about_dialog = self._build_about_dialog()
+		self.about_dialog.set_transient_for(self.props.active_window)
+		self.about_dialog.run()
+		self.about_dialog.hide()
+
+	def _build_about_dialog(self):
+		about_dialog = Gtk.AboutDialog(
 			copyright="© 2018-2021 Romain F. T.",
 			authors=["Romain F. T.", "Fábio Colacio", "Alexis Lozano"],
 			# To tranlators: "translate" this by a list of your names (one name
@@ -282,33 +318,33 @@ class Application(Gtk.Application):
 		                    label=_("Report bugs or ideas"), uri=BUG_REPORT_URL)
 		# about_dialog.get_content_area().add(bug_report_btn) # should i?
 		about_dialog.set_icon_name('com.github.maoschanz.drawing')
-
-		about_dialog.run()
-		about_dialog.destroy()
+		return about_dialog
 
 	def on_quit(self, *args):
 		"""Action callback, quitting the entire app."""
 		if self.shortcuts_window is not None:
 			self.shortcuts_window.destroy()
+			self.shortcuts_window = None
+		if self.about_dialog is not None:
+			self.about_dialog.destroy()
+			self.about_dialog = None
 		if self.prefs_window is not None:
 			self.prefs_window.destroy()
 
-		can_quit = True
 		# Try (= ask confirmation) to quit the main window(s)
 		main_windows = self.get_windows()
 		for w in main_windows:
 			if w.on_close():
-				# User clicked on "cancel"
-				can_quit = False
-			else:
-				w.close()
-				w.destroy()
+				# User clicked on "cancel": the other windows are kept as they
+				# are, without asking anything more.
+				return
+			w.close()
+			w.destroy()
 
 		# The expected behavior, but now theorically useless, since closing all
 		# appwindows should quit automatically. It's too violent to be left
-		# without a guard clause.
-		if can_quit:
-			self.quit()
+		# without a guard clause (the early return above).
+		self.quit()
 
 	############################################################################
 	# Utilities ################################################################
@@ -317,27 +353,30 @@ class Application(Gtk.Application):
 		"""Tells is the app version is even or odd, odd versions being considered
 		as unstable versions. This affects available options and the style of
 		the headerbar."""
-		return (int(self._version.split('.')[1]) * 5) % 10 == 5
+		return self._is_beta
 
 	def get_current_version(self):
 		return self._version
 
-	def add_action_simple(self, action_name, callback, shortcuts):
-		action = Gio.SimpleAction.new(action_name, None)
-		action.connect('activate', callback)
-		self.add_action(action)
-		if shortcuts is not None:
-			self.set_accels_for_action('app.' + action_name, shortcuts)
-
 	def add_action_boolean(self, action_name, default, callback):
 		action = Gio.SimpleAction().new_stateful(action_name, None, \
 		                                      GLib.Variant.new_boolean(default))
 		action.connect('change-state', callback)
 		self.add_action(action)
 
-	def _show_help_page(self, suffix):
+	def _show_help_page(self, page_id):
 		win = self.props.active_window
-		Gtk.show_uri_on_window(win, 'help:drawing' + suffix, Gdk.CURRENT_TIME)
+		uri = self._HELP_URIS[page_id]
+		Gtk.show_uri_on_window(win, uri, Gdk.CURRENT_TIME)
+
+	def _get_valid_files(self, app, arguments):
+		"""Returns the list of what should be opened for the given CLI
+		arguments: a GioFile, or None for a new blank image. Arguments for which
+		no window should be opened are skipped."""
+		# `_get_valid_file` returns a GioFile or a boolean: True would mean the
+		# app should open a new blank image.
+		checked = (self._get_valid_file(app, fpath) for fpath in arguments)
+		return [(None if f is True else f) for f in checked if f is not False]
 
 	def _get_valid_file(self, app, path):
 		"""Creates a GioFile object if the path corresponds to an image. If no
@@ -363,6 +402,14 @@ class Application(Gtk.Application):
 			print(err) # TODO show that message in an empty window
 			return False
 
+		# Regular files named like images are trusted without querying their
+		# content type, which is slow when a lot of files are given (globs).
+		extension = os.path.splitext(path.lower())[1]
+		if extension in IMAGE_EXTENSIONS:
+			file_type = gfile.query_file_type(Gio.FileQueryInfoFlags.NONE, None)
+			if file_type == Gio.FileType.REGULAR:
+				return gfile
+
 		is_image, err = utilities_gfile_is_image(gfile, err)
 		if is_image:
 			return gfile
@@ -27,6 +27,7 @@ class DrOptionsManager():
 		self.window = window
 		self._bottom_panes_dict = {}
 		self._active_pane_id = None
+		self._minimap_label = None # given to the panes built later
 		self._boolean_actions_from_gsetting = {}
 		self._string_actions_from_gsetting = {}
 
@@ -134,6 +135,11 @@ class DrOptionsManager():
 				return
 			self._bottom_panes_dict[pane_id] = new_pane
 			self.window.bottom_panes_box.add(new_pane.action_bar)
+			if self.window.has_good_width_limits:
+				# Panes built late missed the window's `init_adaptability`
+				new_pane.init_adaptability()
+			if self._minimap_label is not None:
+				new_pane.set_minimap_label(self._minimap_label)
 
 	def try_enable_pane(self, pane_id):
 		if pane_id == self._active_pane_id:
@@ -183,6 +189,7 @@ class DrOptionsManager():
 		self.get_active_pane().toggle_options_menu()
 
 	def set_minimap_label(self, label):
+		self._minimap_label = label
 		for pane_id in self._bottom_panes_dict:
 			self._bottom_panes_dict[pane_id].set_minimap_label(label)
 
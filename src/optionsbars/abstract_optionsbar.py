@@ -16,6 +16,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from gi.repository import Gtk
+from .utilities import utilities_get_ui_string
 
 RSRC_PREFIX = '/com/github/maoschanz/drawing/'
 
@@ -27,9 +28,11 @@ class AbstractOptionsBar():
 		# Quite high as a precaution, will be more precise later
 		self._limit_size = 700
 		self._is_narrow = False
+		self._last_width = -1
 
 	def build_ui(self, end_of_path):
-		builder = Gtk.Builder.new_from_resource(RSRC_PREFIX + end_of_path)
+		ui_string = utilities_get_ui_string(RSRC_PREFIX + end_of_path)
+		builder = Gtk.Builder.new_from_string(ui_string, -1)
 		self.action_bar = builder.get_object('bottom-pane')
 		self.cancel_btn = builder.get_object('cancel_btn') # may be None
 		self.centered_box = builder.get_object('centered_box') # may be None
@@ -76,6 +79,7 @@ class AbstractOptionsBar():
 
 	def _set_limit_size(self, temp_limit_size):
 		self._limit_size = int(1.25 * temp_limit_size)
+		self._last_width = -1
 		self.set_compact(True)
 
 	def adapt_to_window_size(self, allocated_width):
@@ -83,15 +87,20 @@ class AbstractOptionsBar():
 		called, depending on a given window width, and the pane's limit
 		previously set."""
 		can_expand = (allocated_width > self._limit_size)
-		incoherent = (can_expand == self._is_narrow)
-		if incoherent:
-			self.set_compact(not self._is_narrow)
+		if can_expand != self._is_narrow:
+			return
+		# A burst of size allocations close to the width of the last transition
+		# shouldn't make the pane switch back and forth.
+		if abs(allocated_width - self._last_width) < 8:
+			return
+		self._last_width = allocated_width
+		self.set_compact(not self._is_narrow)
 
 	def set_compact(self, state):
 		"""The parameter is a boolean telling if the bottom pane should become
 		compact or not."""
 		self._is_narrow = state
-		if self.help_btn is not None:
+		if self.help_btn is not None and self.help_btn.get_visible() == state:
 			self.help_btn.set_visible(not state)
 		# + implementation-specific instructions
 
@@ -39,6 +39,11 @@ class OptionsBarScale(AbstractOptionsBar):
 		self.width_label = builder.get_object('width_label')
 		self.height_label = builder.get_object('height_label')
 		self.separator = builder.get_object('separator')
+		self._applied_state = None
+
+		# Sum of the widgets' preferred widths, measured in the wide layout
+		self._limit_size_cache = None
+		self.action_bar.connect('style-updated', self._invalidate_limit_cache)
 
 	def toggle_options_menu(self):
 		self.options_btn.set_active(not self.options_btn.get_active())
@@ -48,22 +53,32 @@ class OptionsBarScale(AbstractOptionsBar):
 
 	def init_adaptability(self):
 		super().init_adaptability()
-		temp_limit_size = self.centered_box.get_preferred_width()[0] + \
-		                    self.cancel_btn.get_preferred_width()[0] + \
-		                   self.options_btn.get_preferred_width()[0] + \
-		                      self.help_btn.get_preferred_width()[0] + \
-		                     self.apply_btn.get_preferred_width()[0]
-		self._set_limit_size(temp_limit_size)
+		if self._limit_size_cache is None:
+			temp_limit_size = self.centered_box.get_preferred_width()[0] + \
+			                    self.cancel_btn.get_preferred_width()[0] + \
+			                   self.options_btn.get_preferred_width()[0] + \
+			                      self.help_btn.get_preferred_width()[0] + \
+			                     self.apply_btn.get_preferred_width()[0]
+			self._limit_size_cache = temp_limit_size
+		self._set_limit_size(self._limit_size_cache)
+
+	def _invalidate_limit_cache(self, *args):
+		# The theme or the icon size changed, so widths have to be measured again
+		self._limit_size_cache = None
 
 	def set_compact(self, state):
 		super().set_compact(state)
+		# Each of these calls queues a resize, so they're skipped when the
+		# widgets are already in the requested state.
+		if state == self._applied_state:
+			return
+		self._applied_state = state
 		if state:
 			self.centered_box.set_orientation(Gtk.Orientation.VERTICAL)
 		else:
 			self.centered_box.set_orientation(Gtk.Orientation.HORIZONTAL)
-		self.width_label.set_visible(not state)
-		self.height_label.set_visible(not state)
-		self.separator.set_visible(not state)
+		for widget in (self.width_label, self.height_label, self.separator):
+			widget.set_visible(not state)
 
 	############################################################################
 ################################################################################
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from gi.repository import Gtk, Gio, Gdk
+from gi.repository import Gtk, Gio, Gdk, GLib
 from .utilities import utilities_add_unit_to_spinbtn
 
 @Gtk.Template(resource_path='/com/github/maoschanz/drawing/ui/preferences.ui')
@@ -63,9 +63,26 @@ class DrPrefsWindow(Gtk.Window):
 		if is_beta:
 			self.get_style_context().add_class('devel')
 
-		self.page_builder_images()
-		self.page_builder_tools()
-		self.page_builder_advanced(is_beta)
+		# Values of the check flowboxes
+		self._check_state = {}
+		# Values waiting to be written, see `_delay_write`
+		self._pending_writes = {}
+		self._flush_source = None
+		self.connect('destroy', self._on_destroy)
+
+		if not is_beta:
+			self._gsettings.set_boolean('devel-only', False)
+
+		# Pages are built only when they're shown for the first time
+		self._page_builders = {
+			'page_images': (self.page_images, self.page_builder_images),
+			'page_tools': (self.page_tools, self.page_builder_tools),
+			'page_advanced': (self.page_advanced, \
+			                        lambda: self.page_builder_advanced(is_beta))
+		}
+		self._built_pages = set()
+		self.stack.connect('notify::visible-child-name', self._on_page_shown)
+		self._on_page_shown()
 
 	# Each `page_*` attribute is a GtkGrid. Each `page_builder_*` method declare
 	# its grid to be the currently filled one, and reset the counter.
@@ -74,6 +91,17 @@ class DrPrefsWindow(Gtk.Window):
 
 	############################################################################
 
+	def _on_page_shown(self, *args):
+		page_name = self.stack.get_visible_child_name()
+		if page_name is None or page_name in self._built_pages:
+			return
+		self._built_pages.add(page_name)
+		grid, page_builder = self._page_builders[page_name]
+		# The grid notifies its children's properties once the page is complete
+		grid.freeze_child_notify()
+		page_builder()
+		grid.thaw_child_notify()
+
 	def set_current_grid(self, grid):
 		self._current_grid = grid
 		self._grid_attach_cpt = 0
@@ -161,8 +189,6 @@ class DrPrefsWindow(Gtk.Window):
 		if is_beta:
 			# This label will not be displayed in the UI of stable versions
 			self.add_switch(_("Development features"), 'devel-only')
-		else:
-			self._gsettings.set_boolean('devel-only', False)
 		self.add_colorbtn(_("Background color"), 'ui-background-rgba')
 
 		self.add_section_separator()
@@ -209,8 +235,9 @@ class DrPrefsWindow(Gtk.Window):
 		self.attach_large(Gtk.Separator())
 
 	def add_section_title(self, label_text):
-		label = Gtk.Label(halign=Gtk.Align.START, use_markup=True, \
-		                                    label=('<b>' + label_text + '</b>'))
+		# The title is escaped, since translations may contain '&' or '<'
+		markup = '<b>' + GLib.markup_escape_text(label_text) + '</b>'
+		label = Gtk.Label(halign=Gtk.Align.START, use_markup=True, label=markup)
 		self.attach_large(label)
 
 	def add_help(self, label_text):
@@ -236,8 +263,7 @@ class DrPrefsWindow(Gtk.Window):
 
 	def add_switch(self, label_text, key):
 		switch = Gtk.Switch()
-		switch.set_active(self._gsettings.get_boolean(key))
-		switch.connect('notify::active', self.on_bool_changed, key)
+		self._gsettings.bind(key, switch, 'active', Gio.SettingsBindFlags.DEFAULT)
 		self.add_row(label_text, switch)
 
 	def add_colorbtn(self, label_text, key):
@@ -261,60 +287,89 @@ class DrPrefsWindow(Gtk.Window):
 
 	def add_radio_flowbox(self, setting_key, labels_dict):
 		flowbox = Gtk.FlowBox(selection_mode=Gtk.SelectionMode.NONE, expand=True)
-		self._radio_are_active = False
+		active_id = self._gsettings.get_string(setting_key)
 		w0 = None
-		for id0 in labels_dict:
-			w0 = self.build_radio_btn(labels_dict[id0], id0, setting_key, w0)
+		for id0, text in labels_dict.items():
+			w0 = self.build_radio_btn(text, id0, setting_key, w0, active_id)
 			flowbox.add(w0)
-		self._radio_are_active = True
 		self.attach_large(flowbox)
 
-	def build_radio_btn(self, label, btn_id, key, group):
+	def build_radio_btn(self, label, btn_id, key, group, active_id):
 		btn = Gtk.RadioButton(label=label, visible=True, group=group)
-		active_id = self._gsettings.get_string(key)
 		btn.set_active(btn_id == active_id)
 		btn.connect('toggled', self.on_radio_btn_changed, key, btn_id)
 		return btn
 
 	def add_check_flowbox(self, setting_key, labels_dict):
 		flowbox = Gtk.FlowBox(selection_mode=Gtk.SelectionMode.NONE, expand=True)
-		for id0 in labels_dict:
-			w0 = self.build_check_btn(labels_dict[id0], id0, setting_key)
+		unchecked_ids = set(self._gsettings.get_strv(setting_key))
+		self._check_state[setting_key] = unchecked_ids
+		for id0, text in labels_dict.items():
+			w0 = self.build_check_btn(text, id0, setting_key, unchecked_ids)
 			flowbox.add(w0)
 		self.attach_large(flowbox)
 
-	def build_check_btn(self, label, row_id, key):
+	def build_check_btn(self, label, row_id, key, unchecked_ids):
 		btn = Gtk.CheckButton(label=label, visible=True)
-		array_of_strings = self._gsettings.get_strv(key)
-		btn.set_active(row_id not in array_of_strings)
+		btn.set_active(row_id not in unchecked_ids)
 		btn.connect('toggled', self.on_check_btn_changed, key, row_id)
 		return btn
 
 	############################################################################
 	# Generic callbacks ########################################################
 
-	def on_bool_changed(self, switch, state, key):
-		self._gsettings.set_boolean(key, switch.get_active())
-
 	def on_adj_changed(self, spinbtn, key):
-		self._gsettings.set_int(key, spinbtn.get_value_as_int())
+		self._delay_write(key, 'int', spinbtn.get_value_as_int())
 
 	def on_check_btn_changed(self, checkbtn, key, btn_id):
-		array_of_strings = self._gsettings.get_strv(key)
+		unchecked_ids = self._check_state[key]
 		if checkbtn.get_active():
-			array_of_strings.remove(btn_id)
+			unchecked_ids.discard(btn_id)
 		else:
-			array_of_strings.append(btn_id)
-		self._gsettings.set_strv(key, array_of_strings)
+			unchecked_ids.add(btn_id)
+		self._delay_write(key, 'strv', sorted(unchecked_ids))
 
 	def on_radio_btn_changed(self, radiobtn, key, btn_id):
-		if self._radio_are_active:
+		# The button being unset in the group is toggled too, but only the one
+		# becoming active matters.
+		if radiobtn.get_active():
 			self._gsettings.set_string(key, btn_id)
 
 	def on_colorbtn_changed(self, color_btn, key):
 		c = color_btn.get_rgba()
-		color_array = [str(c.red), str(c.green), str(c.blue), str(c.alpha)]
-		self._gsettings.set_strv(key, color_array)
+		color_array = ['%.6f' % v for v in (c.red, c.green, c.blue, c.alpha)]
+		self._delay_write(key, 'strv', color_array)
+
+	############################################################################
+	# Delayed writing ##########################################################
+
+	def _delay_write(self, key, value_type, value):
+		"""Remember a value to write, the actual writing happens a bit later so
+		a burst of changes (e.g. holding a spinbutton arrow) results in a single
+		write per key."""
+		self._pending_writes[key] = (value_type, value)
+		if self._flush_source is None:
+			self._flush_source = GLib.timeout_add(150, self._flush_settings)
+
+	def _flush_settings(self):
+		self._flush_source = None
+		pending_writes = self._pending_writes
+		self._pending_writes = {}
+		gsettings = self._gsettings
+		# Values identical to the stored ones aren't written again
+		for key, (value_type, value) in pending_writes.items():
+			if value_type == 'int':
+				if gsettings.get_int(key) != value:
+					gsettings.set_int(key, value)
+			elif value_type == 'strv':
+				if gsettings.get_strv(key) != value:
+					gsettings.set_strv(key, value)
+		return False
+
+	def _on_destroy(self, *args):
+		if self._flush_source is not None:
+			GLib.source_remove(self._flush_source)
+			self._flush_settings()
 
 	############################################################################
 	# Low-level packing ########################################################
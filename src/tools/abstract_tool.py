@@ -17,6 +17,7 @@
 
 import cairo
 from gi.repository import Gtk
+from .utilities import utilities_get_ui_string
 from .utilities_overlay import utilities_show_overlay_on_context
 
 class WrongToolIdException(Exception):
@@ -32,6 +33,9 @@ class AbstractAbstractTool():
 
 	__gtype_name__ = 'AbstractAbstractTool'
 	UI_PATH = '/com/github/maoschanz/drawing/tools/ui/'
+	# Options menus, by resource path, shared by all windows and by the tools
+	# using the same file, since they're immutable
+	_options_model_cache = {}
 
 	def __init__(self, tool_id, label, icon_name, window, **kwargs):
 		self.window = window
@@ -47,9 +51,13 @@ class AbstractAbstractTool():
 		# The tool's state
 		self.cursor_name = 'cell'
 		self._ongoing_operation = False
-		# Once everything is set, build the UI
+		# The image edited while the tool is active, to avoid looking for it in
+		# the notebook at each event
+		self._active_image = None
+		# Once everything is set, build the UI. The bottom pane is built only
+		# when the tool is selected for the first time.
 		self.build_row()
-		self.try_build_pane()
+		self._pane_built = False
 
 	############################################################################
 	# Utilities managing actions for tool's options ############################
@@ -102,6 +110,11 @@ class AbstractAbstractTool():
 	def try_build_pane(self):
 		pass
 
+	def ensure_pane_built(self):
+		if not self._pane_built:
+			self.try_build_pane()
+			self._pane_built = True
+
 	def build_bottom_pane(self):
 		return None
 
@@ -121,9 +134,17 @@ class AbstractAbstractTool():
 		"""Returns a Gio.MenuModel corresponding to the tool's options. It'll be
 		shown in the menubar (if any) and in the bottom pane (if the tool's
 		bottom pane supports such a feature)."""
-		fpath = self.UI_PATH + 'tool-' + self.id + '.ui'
-		builder = Gtk.Builder.new_from_resource(fpath)
-		return builder.get_object('options-menu')
+		return self.load_options_model(self.UI_PATH + 'tool-' + self.id + '.ui')
+
+	def load_options_model(self, resource_path):
+		"""Returns the 'options-menu' object of the UI file `resource_path`,
+		which is parsed only once."""
+		cache = AbstractAbstractTool._options_model_cache
+		if resource_path not in cache:
+			ui_string = utilities_get_ui_string(resource_path)
+			builder = Gtk.Builder.new_from_string(ui_string, -1)
+			cache[resource_path] = builder.get_object('options-menu')
+		return cache[resource_path]
 
 	def get_options_widget(self):
 		"""Returns a Gtk.Widget (normally a box) corresponding to the tool's
@@ -146,40 +167,40 @@ class AbstractAbstractTool():
 		                                                tooltip_text=self.label)
 		self.row.set_detailed_action_name('win.active_tool::' + self.id)
 		self.label_widget = Gtk.Label(label=self.label) #, use_underline=True)
-		if self.window.gsettings.get_boolean('big-icons'):
+		if self.window.gsettings_cache['big-icons']:
 			size = Gtk.IconSize.LARGE_TOOLBAR
 		else:
 			size = Gtk.IconSize.SMALL_TOOLBAR
-		image = Gtk.Image().new_from_icon_name(self.icon_name, size)
-		box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-		box.add(image)
-		box.add(self.label_widget)
-		self.row.add(box)
+		self._row_image = Gtk.Image().new_from_icon_name(self.icon_name, size)
+		self._row_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+		self._row_box.add(self._row_image)
+		self._row_box.add(self.label_widget)
+		self.row.add(self._row_box)
 		self.row.show_all()
 
 	def set_show_label(self, label_visible):
 		self.label_widget.set_visible(label_visible)
 		if label_visible:
-			self.row.get_children()[0].set_halign(Gtk.Align.START)
+			self._row_box.set_halign(Gtk.Align.START)
 		else:
-			self.row.get_children()[0].set_halign(Gtk.Align.CENTER)
+			self._row_box.set_halign(Gtk.Align.CENTER)
 
 	def update_icon_size(self):
-		image = self.row.get_children()[0].get_children()[0]
-		if self.window.gsettings.get_boolean('big-icons'):
+		if self.window.gsettings_cache['big-icons']:
 			size = Gtk.IconSize.LARGE_TOOLBAR
 		else:
 			size = Gtk.IconSize.SMALL_TOOLBAR
-		image.set_from_icon_name(self.icon_name, size)
+		self._row_image.set_from_icon_name(self.icon_name, size)
 
 	############################################################################
 	# Activation or not ########################################################
 
 	def on_tool_selected(self):
-		pass
+		self.ensure_pane_built()
+		self._active_image = self.window.get_active_image()
 
 	def on_tool_unselected(self):
-		pass
+		self._active_image = None
 
 	def cancel_ongoing_operation(self):
 		self.on_tool_unselected()
@@ -225,6 +246,16 @@ class AbstractAbstractTool():
 		self._ongoing_operation = False
 		self.non_destructive_show_modif() # XXX nécessaire ?
 
+	def simple_apply_operation_fast(self, operation):
+		"""Same as `simple_apply_operation` but errors aren't caught, and the
+		image isn't updated: the caller (rebuilding from history) does it once
+		for all the operations."""
+		try:
+			self.do_tool_operation(operation)
+			self.get_image().add_to_history(operation)
+		finally:
+			self._ongoing_operation = False
+
 	############################################################################
 	# Selection ################################################################
 
@@ -241,7 +272,9 @@ class AbstractAbstractTool():
 	# Image management #########################################################
 
 	def get_image(self):
-		return self.window.get_active_image()
+		if self._active_image is None:
+			return self.window.get_active_image()
+		return self._active_image
 
 	def get_surface(self):
 		return self.get_image().get_surface()
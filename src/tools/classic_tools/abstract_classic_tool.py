@@ -39,6 +39,9 @@ class AbstractClassicTool(AbstractAbstractTool):
 		self._use_antialias = self.load_tool_action_boolean('antialias', \
 		                                                     'use-antialiasing')
 		# XXX honteusement sous-performant ^
+		# The pane has the colors and the size used by all classic tools, and
+		# the window needs them even when no classic tool has been selected.
+		self.ensure_pane_built()
 
 	############################################################################
 	# UI implementations #######################################################
@@ -50,9 +53,6 @@ class AbstractClassicTool(AbstractAbstractTool):
 	def build_bottom_pane(self):
 		return OptionsBarClassic(self.window)
 
-	def on_tool_selected(self):
-		pass
-
 	############################################################################
 	# Options ##################################################################
 
@@ -18,6 +18,7 @@
 import cairo
 from gi.repository import Gtk, Gdk, Pango, PangoCairo
 from .abstract_classic_tool import AbstractClassicTool
+from .utilities import utilities_get_ui_string
 
 class ToolText(AbstractClassicTool):
 	__gtype_name__ = 'ToolText'
@@ -42,7 +43,8 @@ class ToolText(AbstractClassicTool):
 		self.add_tool_action_simple('text-preview', self._force_refresh)
 		self.add_tool_action_simple('text-insert', self._on_insert_text)
 
-		builder = Gtk.Builder().new_from_resource(self.UI_PATH + 'tool-text.ui')
+		ui_string = utilities_get_ui_string(self.UI_PATH + 'tool-text.ui')
+		builder = Gtk.Builder.new_from_string(ui_string, -1)
 		# Widgets for text insertion
 		self._popover = builder.get_object('insertion-popover')
 		self._entry = builder.get_object('entry')
@@ -98,6 +100,7 @@ class ToolText(AbstractClassicTool):
 		self._last_click_btn = 1
 
 	def on_tool_unselected(self):
+		super().on_tool_unselected()
 		self.set_action_sensitivity('paste', True)
 		self.set_action_sensitivity('select_all', True)
 		self.set_action_sensitivity('selection_cut', True)
@@ -16,7 +16,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import cairo
-from gi.repository import Gtk
 from .abstract_tool import AbstractAbstractTool
 from .optionsbar_selection import OptionsBarSelection
 from .utilities_overlay import utilities_show_overlay_on_context
@@ -51,8 +50,7 @@ class AbstractSelectionTool(AbstractAbstractTool):
 		return label
 
 	def get_options_model(self):
-		builder = Gtk.Builder.new_from_resource(self.UI_PATH + 'selection.ui')
-		return builder.get_object('options-menu')
+		return self.load_options_model(self.UI_PATH + 'selection.ui')
 
 	def try_build_pane(self):
 		self.pane_id = 'selection'
@@ -157,6 +157,22 @@ def _add_spinbutton_icon(spinbutton, icon, tooltip):
 
 ################################################################################
 
+_RESOURCE_CACHE = {}
+
+def utilities_get_ui_string(resource_path):
+	"""Returns the content of a UI file from the GResource bundle. The XML is
+	kept in memory, so windows opened later don't have to look it up again,
+	but each caller still builds its own widgets from it."""
+	ui_string = _RESOURCE_CACHE.get(resource_path)
+	if ui_string is None:
+		flags = Gio.ResourceLookupFlags.NONE
+		ui_bytes = Gio.resources_lookup_data(resource_path, flags)
+		ui_string = ui_bytes.get_data().decode('utf-8')
+		_RESOURCE_CACHE[resource_path] = ui_string
+	return ui_string
+
+################################################################################
+
 def utilities_gfile_is_image(gfile, error_msg=""):
 	try:
 		infos = gfile.query_info('standard::*', Gio.FileQueryInfoFlags.NONE, None)
@@ -105,6 +105,11 @@ class DrWindow(Gtk.ApplicationWindow):
 		self.active_tool_id = None
 		self._is_tools_initialisation_finished = False
 
+		# Settings read by each tool, kept here to avoid reading them N times
+		self.gsettings_cache = {
+			'big-icons': self.gsettings.get_boolean('big-icons'),
+		}
+
 		if self.gsettings.get_boolean('maximized'):
 			self.maximize()
 
@@ -687,7 +692,10 @@ class DrWindow(Gtk.ApplicationWindow):
 			self.options_manager.init_adaptability()
 			self._decorations.init_adaptability()
 			self.has_good_width_limits = True
-		self._decorations.adapt_to_window_size()
+		else:
+			# just after `init_adaptability`, the decorations adapt themselves
+			# once idle, so it would be useless to do it now
+			self._decorations.adapt_to_window_size()
 
 		available_width = self.bottom_panes_box.get_allocated_width()
 		if not self._is_tools_initialisation_finished:
@@ -785,6 +793,7 @@ class DrWindow(Gtk.ApplicationWindow):
 	# SIDE PANE (TOOLS) ########################################################
 
 	def on_icon_size_changed(self, *args):
+		self.gsettings_cache['big-icons'] = self.gsettings.get_boolean('big-icons')
 		for tool_id in self.tools:
 			self.tools[tool_id].update_icon_size()
 